@@ -6,6 +6,7 @@ from/to a JSON configuration file.
 
 import json
 import os
+import sys
 
 CONFIG_FILE = "config.json"
 DEFAULT_CONFIG = {
@@ -31,7 +32,7 @@ def load_config():
             # Merge with defaults for any missing keys
             return {**DEFAULT_CONFIG, **config}
     except Exception as e:
-        print(f"Error loading config: {e}, using defaults")
+        print(f"Error loading config: {e}, using defaults", file=sys.stderr)
         return DEFAULT_CONFIG.copy()
 
 def save_config(config):
@@ -48,7 +49,7 @@ def save_config(config):
             json.dump(config, f, indent=2)
         return True
     except Exception as e:
-        print(f"Error saving config: {e}")
+        print(f"Error saving config: {e}", file=sys.stderr)
         return False
 
 def get_config_value(key, default=None):
@@ -2,15 +2,23 @@
 labeler_backend.py
 Python backend for Electron labeler app.
 Receives JSON messages via stdin, executes methods, returns results via stdout.
+Messages in both directions are length-prefixed frames (see read_frame).
 """
 
 import sys
 import json
 import os
+import base64
+import functools
+import logging
+import logging.handlers
+import queue
+import atexit
 import h5py
+import orjson
 import pandas as pd
 import numpy as np
-from scipy import signal
+from scipy import fft, ndimage, signal
 from pathlib import Path
 from config import load_config
 
@@ -22,6 +30,34 @@ LABELS_DIR = config["labels_directory"]
 # SAMPLING_FREQ = 250  # Hz - now read from metadata
 # SEGMENT_LENGTH = 2000  # samples - now read from metadata as chunk_size
 
+# Set LABELER_DEBUG=1 to log per-request diagnostics
+DEBUG = os.environ.get('LABELER_DEBUG', '') not in ('', '0')
+
+# Data file types listed by get_csv_files
+DATA_FILE_EXTENSIONS = ('.h5', '.hdf5', '.csv')
+
+# Savitzky-Golay filters switch to FFT convolution for signals at least this
+# long with windows at least this wide; below ~100 taps direct convolution
+# is faster even on multi-million sample recordings
+FFT_CONVOLVE_MIN_SAMPLES = 100_000
+FFT_CONVOLVE_MIN_WINDOW = 101
+# Sliding windows copied per block when applying stacked Savitzky-Golay kernels
+SAVGOL_BLOCK_SAMPLES = 4096
+
+# Size of the little-endian length header on each stdin/stdout frame
+FRAME_HEADER_BYTES = 4
+
+# Metadata of loaded files, so get_segment can read them by handle
+FILE_CACHE_SIZE = 4
+_FILE_CACHE = {}
+# Recently loaded files whose responses are reused while unchanged on disk
+LOAD_CACHE_SIZE = 4
+
+# Per-labeler index of {label file base name: {mtime_ns, size, review}}
+REVIEW_INDEX_FILE = "review_index.json"
+# Files in a labeler directory that are not per-file labels
+NON_LABEL_FILES = {"done_files.json", REVIEW_INDEX_FILE}
+
 def strip_hdf5_extension(filename):
     """Remove .h5 or .hdf5 extension from filename for cleaner label file names."""
     if filename.lower().endswith('.h5'):
@@ -30,95 +66,342 @@ def strip_hdf5_extension(filename):
         return filename[:-5]
     return filename
 
+def _create_logger():
+    """Create the backend logger: stderr plus backend_debug.log, opened once.
+
+    Records are put on a queue and written by a background QueueListener
+    thread, so request handling never waits on log I/O.
+    """
+    backend_logger = logging.getLogger('labeler_backend')
+    backend_logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+    backend_logger.propagate = False
+
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+
+    # delay=True: the file is only created once something is logged
+    file_handler = logging.FileHandler('backend_debug.log', delay=True)
+    file_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    backend_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, stderr_handler, file_handler)
+    listener.start()
+    # Drain anything still queued when the backend exits
+    atexit.register(listener.stop)
+    return backend_logger
+
+logger = _create_logger()
+
 def log_error(message):
     """Log error to stderr and to a file."""
-    print(f"ERROR: {message}", file=sys.stderr, flush=True)
-    try:
-        with open('backend_debug.log', 'a') as f:
-            f.write(f"{message}\n")
-    except:
-        pass
+    logger.error(message)
+
+def log_debug(message):
+    """Log per-request diagnostics; dropped unless LABELER_DEBUG is set."""
+    if DEBUG:
+        logger.debug(message)
 
 def get_csv_files(params):
     """Get all HDF5 files in the specified folder."""
     folder = params.get('folder', '.')
-    log_error(f"get_csv_files called with folder: {folder}")
-    log_error(f"Folder exists: {os.path.exists(folder)}")
+    log_debug(f"get_csv_files called with folder: {folder}")
+    log_debug(f"Folder exists: {os.path.exists(folder)}")
 
     if not os.path.exists(folder):
-        log_error(f"Folder does not exist, returning empty list")
+        log_debug("Folder does not exist, returning empty list")
         return []
 
-    all_files = os.listdir(folder)
-    log_error(f"All files in folder: {all_files}")
+    # Single directory pass; matching is case-sensitive like load_patient_file
+    with os.scandir(folder) as entries:
+        files = sorted(entry.name for entry in entries
+                       if entry.name.endswith(DATA_FILE_EXTENSIONS) and entry.is_file())
+    log_debug(f"Found {len(files)} data files")
+    return files
 
-    files = [f for f in all_files
-             if f.endswith('.h5') or f.endswith('.hdf5') or f.endswith('.csv')]
-    log_error(f"Filtered files: {files}")
-    return sorted(files)
+def encode_signal_columns(signals):
+    """Encode each signal as base64 of its little-endian float32 bytes.
 
-def compute_abp_derivatives(df, sampling_rate):
-    """Compute first and second derivatives of ABP signal using Savitzky-Golay filter.
+    The frontend decodes each column straight into a Float32Array, which is
+    about 4x smaller on the pipe than JSON numbers and needs no parsing.
 
     Args:
-        df: DataFrame containing signal data
-        sampling_rate: Sampling rate in Hz
+        signals: dict mapping signal name to 1D array
 
     Returns:
-        df: DataFrame with added ABP_d1 and ABP_d2 columns (if ABP signal exists)
+        dict mapping column name to base64 string
     """
-    # Find ABP signal (case-insensitive)
-    abp_col = None
-    for col in df.columns:
-        if col.upper() == 'ABP' or 'ABP' in col.upper():
-            abp_col = col
-            break
+    return {
+        col: base64.b64encode(np.ascontiguousarray(values, dtype='<f4').tobytes()).decode('ascii')
+        for col, values in signals.items()
+    }
 
-    if abp_col is None:
-        return df
+def decode_signal_columns(file_data):
+    """Decode file data produced by load_patient_file into a 2D array.
 
-    # Get ABP signal as numpy array
-    abp_signal = df[abp_col].values
+    Accepts both the base64 float32 column encoding and the legacy
+    row-oriented list format.
 
-    # Savitzky-Golay filter parameters
+    Returns:
+        np.ndarray of shape (n_samples, len(file_data['columns']))
+    """
+    if file_data.get('encoding') == 'b64':
+        return np.column_stack([
+            np.frombuffer(base64.b64decode(file_data['data'][col]), dtype='<f4')
+            for col in file_data['columns']
+        ])
+    return np.asarray(file_data['data'])
+
+def as_float_signal(x):
+    """Return x as a floating point array, keeping float32 input in float32."""
+    x = np.asarray(x)
+    if x.dtype not in (np.float32, np.float64):
+        x = x.astype(np.float64)
+    return x
+
+@functools.lru_cache(maxsize=None)
+def savgol_coefficients(window_length, polyorder, deriv, dtype=np.float64):
+    """Return cached Savitzky-Golay convolution coefficients.
+
+    Coefficients depend only on (window_length, polyorder, deriv), so they are
+    computed once per combination instead of on every filter call. They are
+    stored in the signal's dtype so float32 signals are convolved in float32.
+    """
+    coeffs = signal.savgol_coeffs(window_length, polyorder, deriv=deriv, use='conv').astype(dtype)
+    coeffs.setflags(write=False)
+    return coeffs
+
+def _fit_savgol_edge(x, y, window_start, window_stop, interp_start, interp_stop, polyorder, deriv):
+    """Fill y[interp_start:interp_stop] from a polynomial fit to one edge window."""
+    poly_coeffs = np.polyfit(np.arange(window_stop - window_start), x[window_start:window_stop], polyorder)
+    if deriv > 0:
+        poly_coeffs = np.polyder(poly_coeffs, deriv)
+    i = np.arange(interp_start - window_start, interp_stop - window_start)
+    y[interp_start:interp_stop] = np.polyval(poly_coeffs, i)
+
+def use_fft_convolution(n, window_length):
+    """Return True if FFT convolution beats direct convolution for this filter."""
+    return n >= FFT_CONVOLVE_MIN_SAMPLES and window_length >= FFT_CONVOLVE_MIN_WINDOW
+
+def savgol_derivative(x, window_length, polyorder, deriv):
+    """Apply a Savitzky-Golay filter using cached coefficients.
+
+    Matches signal.savgol_filter(x, window_length, polyorder, deriv=deriv)
+    with its default mode='interp': the interior is a direct convolution and
+    the edges are filled from a polynomial fit to the first/last window.
+
+    Args:
+        x: 1D signal
+        window_length: Odd filter window length (samples)
+        polyorder: Polynomial order
+        deriv: Derivative order (per sample)
+
+    Returns:
+        np.ndarray of filtered values, same length as x
+    """
+    x = as_float_signal(x)
+    n = x.shape[0]
+    if window_length > n:
+        raise ValueError("window_length must be less than or equal to the size of x")
+
+    coeffs = savgol_coefficients(window_length, polyorder, deriv, x.dtype.type)
+    if use_fft_convolution(n, window_length):
+        y = signal.oaconvolve(x, coeffs, mode='same')
+    else:
+        y = ndimage.convolve1d(x, coeffs, mode='constant')
+
+    halflen = window_length // 2
+    _fit_savgol_edge(x, y, 0, window_length, 0, halflen, polyorder, deriv)
+    _fit_savgol_edge(x, y, n - window_length, n, n - halflen, n, polyorder, deriv)
+    return y
+
+def savgol_derivatives(x, window_length, polyorder, derivs):
+    """Apply several Savitzky-Golay derivative filters in one pass over x.
+
+    The kernels are stacked into a (len(derivs), window_length) matrix and
+    applied to blocks of sliding windows with a single matmul per block, so
+    the signal is read once regardless of how many derivatives are needed.
+    For long signals with wide windows, one FFT of the signal is shared by
+    every kernel instead. Edges are handled as in savgol_derivative.
+
+    Args:
+        x: 1D signal
+        window_length: Odd filter window length (samples)
+        polyorder: Polynomial order
+        derivs: Sequence of derivative orders (per sample)
+
+    Returns:
+        list of np.ndarray, one per entry in derivs, each the same length as x
+    """
+    x = as_float_signal(x)
+    n = x.shape[0]
+    if window_length > n:
+        raise ValueError("window_length must be less than or equal to the size of x")
+
+    halflen = window_length // 2
+    y = np.empty((len(derivs), n), dtype=x.dtype)
+
+    if use_fft_convolution(n, window_length):
+        fft_len = fft.next_fast_len(n + window_length - 1, real=True)
+        x_fft = fft.rfft(x, fft_len)
+        for row, deriv in zip(y, derivs):
+            kernel = savgol_coefficients(window_length, polyorder, deriv, x.dtype.type)
+            row[:] = fft.irfft(x_fft * fft.rfft(kernel, fft_len), fft_len)[halflen:halflen + n]
+    else:
+        # Reversed convolution coefficients are the dot-product (correlation) form
+        kernels = np.stack([savgol_coefficients(window_length, polyorder, d, x.dtype.type)[::-1]
+                            for d in derivs])
+        windows = np.lib.stride_tricks.sliding_window_view(x, window_length)
+        for start in range(0, windows.shape[0], SAVGOL_BLOCK_SAMPLES):
+            block = np.ascontiguousarray(windows[start:start + SAVGOL_BLOCK_SAMPLES])
+            stop = start + block.shape[0]
+            y[:, halflen + start:halflen + stop] = (block @ kernels.T).T
+
+    for row, deriv in zip(y, derivs):
+        _fit_savgol_edge(x, row, 0, window_length, 0, halflen, polyorder, deriv)
+        _fit_savgol_edge(x, row, n - window_length, n, n - halflen, n, polyorder, deriv)
+    return list(y)
+
+@functools.lru_cache(maxsize=32)
+def find_abp_column(columns):
+    """Return the first column whose name contains 'ABP' (case-insensitive), or None.
+
+    Args:
+        columns: tuple of column names (hashable, so results are cached per file layout)
+    """
+    for col in columns:
+        if 'ABP' in col.upper():
+            return col
+    return None
+
+def abp_derivative_window_length(sampling_rate):
+    """Savitzky-Golay window length used for the ABP derivatives."""
     # Window length: 0.06 * sampling_rate (should be ~15 for 250 Hz)
     window_length = int(0.06 * sampling_rate)
     # Ensure window_length is odd (required by savgol_filter)
     if window_length % 2 == 0:
         window_length += 1
     # Ensure window_length is at least 5 (minimum for polyorder=3)
-    window_length = max(window_length, 5)
+    return max(window_length, 5)
+
+def compute_abp_derivatives(signals, sampling_rate):
+    """Compute first and second derivatives of ABP signal using Savitzky-Golay filter.
+
+    Args:
+        signals: dict mapping signal name to 1D array
+        sampling_rate: Sampling rate in Hz
+
+    Returns:
+        signals: dict with added ABP_d1 and ABP_d2 entries (if ABP signal exists)
+    """
+    # Find ABP signal (case-insensitive)
+    abp_col = find_abp_column(tuple(signals))
+
+    if abp_col is None:
+        return signals
+
+    abp_signal = signals[abp_col]
+
+    # Savitzky-Golay filter parameters
+    window_length = abp_derivative_window_length(sampling_rate)
     polyorder = 3
 
     try:
-        # Compute first derivative (velocity)
-        abp_d1 = signal.savgol_filter(abp_signal, window_length, polyorder, deriv=1)
+        # Compute first (velocity) and second (acceleration) derivatives together
+        abp_d1, abp_d2 = savgol_derivatives(abp_signal, window_length, polyorder, derivs=(1, 2))
 
-        # Compute second derivative (acceleration)
-        abp_d2 = signal.savgol_filter(abp_signal, window_length, polyorder, deriv=2)
+        signals['ABP_d1'] = abp_d1
+        signals['ABP_d2'] = abp_d2
 
-        # Add to DataFrame
-        df['ABP_d1'] = abp_d1
-        df['ABP_d2'] = abp_d2
-
-        log_error(f"Computed ABP derivatives with window_length={window_length}, polyorder={polyorder}")
+        log_debug(f"Computed ABP derivatives with window_length={window_length}, polyorder={polyorder}")
     except Exception as e:
         log_error(f"Error computing ABP derivatives: {e}")
 
-    return df
+    return signals
+
 
+def cache_file(handle, entry):
+    """Store a loaded file's entry in _FILE_CACHE, evicting the oldest entry."""
+    _FILE_CACHE.pop(handle, None)
+    if len(_FILE_CACHE) >= FILE_CACHE_SIZE:
+        _FILE_CACHE.pop(next(iter(_FILE_CACHE)))
+    _FILE_CACHE[handle] = entry
+
+def read_cached_signals(entry, start_idx, end_idx):
+    """Read samples [start_idx, end_idx) of each raw signal in a cached file.
+
+    The file is opened only for this read, so it is never left locked
+    against other writers. HDF5 signals are read as hyperslabs: only the
+    chunk rows overlapping the range for chunked files, or the range itself
+    for legacy flat files.
+
+    Returns:
+        dict mapping each raw signal name to a 1D array
+    """
+    filepath = entry['path']
+    if os.stat(filepath).st_mtime_ns != entry['mtime_ns']:
+        raise ValueError("File changed on disk, reload it to get segments")
+
+    if entry['format'] == 'csv':
+        df = pd.read_csv(filepath, usecols=entry['signal_columns'],
+                         skiprows=range(1, start_idx + 1), nrows=end_idx - start_idx)
+        return {col: df[col].to_numpy(dtype=np.float32) for col in entry['signal_columns']}
+
+    data = {}
+    with h5py.File(filepath, 'r') as hf:
+        for signal_name in entry['signal_columns']:
+            dset = hf['signals'][signal_name]
+            if dset.ndim == 2:
+                # Chunked format: (n_chunks, chunk_size)
+                chunk_size = dset.shape[1]
+                row_start = start_idx // chunk_size
+                row_stop = -(-end_idx // chunk_size)
+                rows = dset[row_start:row_stop].reshape(-1)
+                offset = row_start * chunk_size
+                data[signal_name] = rows[start_idx - offset:end_idx - offset]
+            else:
+                data[signal_name] = dset[start_idx:end_idx]
+            data[signal_name] = data[signal_name].astype(np.float32, copy=False)
+    return data
 
 def load_patient_file(params):
     """Load patient file (HDF5 or CSV) into a serializable format with metadata.
 
-    Supports both legacy flat format and new chunked format.
+    Supports both legacy flat format and new chunked format. Results are
+    cached by (path, modification time), so reopening an unchanged file
+    skips reading and deriving it again.
 
     Returns:
-        dict with 'columns', 'data', 'metadata', and 'annotations'
+        dict with 'handle', 'columns', 'data', 'metadata', and 'annotations'
     """
     filename = params['filename']
     folder = params.get('folder', '.')
-    filepath = os.path.join(folder, filename)
+    filepath = os.path.abspath(os.path.join(folder, filename))
+    mtime_ns = os.stat(filepath).st_mtime_ns
+    handle = f"{filepath}:{mtime_ns}"
+
+    response, entry = read_patient_file(filepath, mtime_ns)
+
+    # Register the file for get_segment, which reopens it for each read
+    cache_file(handle, entry)
+
+    return response
+
+@functools.lru_cache(maxsize=LOAD_CACHE_SIZE)
+def read_patient_file(filepath, mtime_ns):
+    """Read a patient file from disk and build its load_patient_file response.
+
+    Args:
+        filepath: Absolute path to the file
+        mtime_ns: File modification time, part of the cache key so edited
+            files are read again
+
+    Returns:
+        (response, entry) where entry describes the file for _FILE_CACHE.
+        Both are shared between cache hits and must not be modified.
+    """
+    filename = os.path.basename(filepath)
+    handle = f"{filepath}:{mtime_ns}"
 
     if filename.endswith('.h5') or filename.endswith('.hdf5'):
         # Load HDF5 file
@@ -163,15 +446,17 @@ def load_patient_file(params):
                 if 'metadata/target_num_blocks' in hf:
                     metadata['target_num_blocks'] = int(hf['metadata/target_num_blocks'][()])
 
-                # Load chunked signals - flatten to 1D for compatibility
+                # Load chunked signals - flatten to 1D for compatibility.
+                # All signals share one (n_chunks, chunk_size) shape, so read
+                # each straight into a row of one preallocated buffer
                 signal_names = list(hf['signals'].keys())
-                data = {}
-                for signal_name in signal_names:
-                    chunks = hf['signals'][signal_name][:]  # (n_chunks, chunk_size)
-                    # Flatten: concatenate all chunks
-                    data[signal_name] = chunks.flatten().tolist()
+                dsets = [hf['signals'][signal_name] for signal_name in signal_names]
+                n_total = dsets[0].shape[0] * dsets[0].shape[1] if dsets else 0
+                buf = np.empty((len(dsets), n_total), dtype=np.float32)
+                for i, dset in enumerate(dsets):
+                    dset.read_direct(buf[i].reshape(dset.shape))
 
-                df = pd.DataFrame(data)
+                signals = dict(zip(signal_names, buf))
 
                 # Optionally load annotations
                 annotations = {}
@@ -188,11 +473,9 @@ def load_patient_file(params):
             else:
                 # Legacy flat format
                 signal_names = list(hf['signals'].keys())
-                data = {}
+                signals = {}
                 for signal_name in signal_names:
-                    data[signal_name] = hf['signals'][signal_name][:].tolist()
-
-                df = pd.DataFrame(data)
+                    signals[signal_name] = hf['signals'][signal_name][...].astype(np.float32, copy=False)
 
                 # Default metadata for legacy files
                 metadata = {
@@ -208,6 +491,12 @@ def load_patient_file(params):
     else:
         # Load CSV file
         df = pd.read_csv(filepath)
+        # Only numeric columns are signals; skip the rest (e.g. timestamps)
+        numeric = df.select_dtypes('number')
+        skipped_columns = [col for col in df.columns if col not in numeric.columns]
+        if skipped_columns:
+            logger.warning(f"Skipping non-numeric columns in {filename}: {skipped_columns}")
+        signals = {col: numeric[col].to_numpy(dtype=np.float32) for col in numeric.columns}
 
         # Default metadata for CSV files
         metadata = {
@@ -220,18 +509,38 @@ def load_patient_file(params):
         annotations = {}
         cpr_labels = None  # CSV format doesn't have CPR labels
 
+    signal_columns = list(signals)
+    n_samples = len(signals[signal_columns[0]]) if signal_columns else 0
+
     # Compute ABP derivatives
     sampling_rate = metadata.get('sampling_rate', 250)
-    df = compute_abp_derivatives(df, sampling_rate)
+    signals = compute_abp_derivatives(signals, sampling_rate)
+
+    # Describe the file so segments can be read back from disk without the
+    # client sending the whole file back; no data or open file is kept
+    entry = {
+        'path': filepath,
+        'format': 'hdf5' if filename.endswith('.h5') or filename.endswith('.hdf5') else 'csv',
+        'mtime_ns': mtime_ns,
+        'signal_columns': signal_columns,
+        'columns': list(signals),
+        'n_samples': n_samples,
+        'metadata': metadata
+    }
 
     # Return data in serializable format
-    return {
-        'columns': df.columns.tolist(),
-        'data': df.values.tolist(),
+    response = {
+        'handle': handle,
+        'columns': list(signals),
+        'dtype': 'f32',
+        'encoding': 'b64',
+        'n_samples': n_samples,
+        'data': encode_signal_columns(signals),
         'metadata': metadata,
         'annotations': annotations,
         'cpr_labels': cpr_labels
     }
+    return response, entry
 
 def load_labels(params):
     """Load labels for a specific patient file."""
@@ -276,6 +585,12 @@ def save_labels(params):
     with open(label_file, 'w') as f:
         json.dump(labels, f, indent=2)
 
+    # Keep the review index in sync so load_review_files needn't parse every file
+    review_index = read_review_index(label_dir)
+    if review_index is not None:
+        review_index[base_filename] = review_index_entry(os.stat(label_file), has_review_segment(labels))
+        write_review_index(label_dir, review_index)
+
     return {"success": True}
 
 def load_done_files(params):
@@ -323,38 +638,82 @@ def toggle_done_file(params):
 
     return {"success": True, "is_done": is_done, "done_files": done_files}
 
+def has_review_segment(labels):
+    """Return True if any segment in a labels dict is marked for review."""
+    return any(isinstance(segment_data, dict) and segment_data.get('review', False)
+               for segment_data in labels.values())
+
+def review_index_entry(stat_result, has_review):
+    """Build a review index entry for a label file with the given os.stat result."""
+    return {'mtime_ns': stat_result.st_mtime_ns, 'size': stat_result.st_size, 'review': has_review}
+
+def read_review_index(labeler_dir):
+    """Read a labeler's review index, or None if it has not been built yet."""
+    index_file = os.path.join(labeler_dir, REVIEW_INDEX_FILE)
+    if not os.path.exists(index_file):
+        return None
+    try:
+        with open(index_file, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        log_error(f"Error reading review index, rebuilding: {e}")
+        return None
+
+def write_review_index(labeler_dir, review_index):
+    """Atomically replace a labeler's review index."""
+    index_file = os.path.join(labeler_dir, REVIEW_INDEX_FILE)
+    tmp_file = index_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(review_index, f, indent=2)
+    os.replace(tmp_file, index_file)
+
 def load_review_files(params):
-    """Load list of files that have any segment marked for review for a labeler."""
+    """Load list of files that have any segment marked for review for a labeler.
+
+    Review flags come from the labeler's review index. A label file is
+    parsed again (and its entry updated) whenever it is missing from the
+    index or its modification time or size no longer match, so edits made
+    outside this process are picked up too.
+    """
     labeler_name = params['labeler_name']
     # Use passed labels_directory if provided, otherwise fall back to config
     labels_dir = params.get('labels_directory', LABELS_DIR)
     labeler_dir = os.path.join(labels_dir, labeler_name)
 
-    review_files = []
-
     if not os.path.exists(labeler_dir):
-        return review_files
+        return []
 
-    # Scan all label JSON files in the labeler's directory
-    for filename in os.listdir(labeler_dir):
-        if filename.endswith('.json') and filename != 'done_files.json':
-            label_file = os.path.join(labeler_dir, filename)
+    stored_index = read_review_index(labeler_dir) or {}
+    review_index = {}
+
+    # Label files are named without the data file extension
+    with os.scandir(labeler_dir) as entries:
+        for dir_entry in entries:
+            filename = dir_entry.name
+            if not filename.endswith('.json') or filename in NON_LABEL_FILES:
+                continue
+            base_name = filename[:-5]  # Remove .json
             try:
-                with open(label_file, 'r') as f:
-                    labels = json.load(f)
-                    # Check if any segment has review: true
-                    for segment_id, segment_data in labels.items():
-                        if isinstance(segment_data, dict) and segment_data.get('review', False):
-                            # Add the original file name (with extension)
-                            # The label file is named without extension, need to find actual file
-                            base_name = filename[:-5]  # Remove .json
-                            # Return the base name - frontend will match against h5/hdf5 files
-                            review_files.append(base_name)
-                            break  # Once we find one review segment, file is marked
+                stat_result = dir_entry.stat()
+                stored = stored_index.get(base_name)
+                if (isinstance(stored, dict)
+                        and stored.get('mtime_ns') == stat_result.st_mtime_ns
+                        and stored.get('size') == stat_result.st_size):
+                    review_index[base_name] = stored
+                    continue
+                with open(dir_entry.path, 'r') as f:
+                    review_index[base_name] = review_index_entry(stat_result, has_review_segment(json.load(f)))
             except Exception as e:
                 log_error(f"Error reading label file {filename}: {e}")
 
-    return review_files
+    if review_index != stored_index:
+        try:
+            write_review_index(labeler_dir, review_index)
+        except Exception as e:
+            log_error(f"Error writing review index: {e}")
+
+    # Return the base names - frontend will match against h5/hdf5 files
+    return [base_name for base_name, entry in review_index.items() if entry['review']]
 
 
 def load_in_progress_files(params):
@@ -370,7 +729,7 @@ def load_in_progress_files(params):
 
     # Scan all label JSON files in the labeler's directory
     for filename in os.listdir(labeler_dir):
-        if filename.endswith('.json') and filename != 'done_files.json':
+        if filename.endswith('.json') and filename not in NON_LABEL_FILES:
             # Add the base name (without .json extension)
             base_name = filename[:-5]
             in_progress_files.append(base_name)
@@ -384,41 +743,83 @@ def find_peaks(params):
     segment_index = params['segment_index']
 
     # Convert to numpy array
-    signal_array = np.array(signal_data)
+    signal_array = np.array(signal_data, dtype=np.float32)
 
     # Find peaks (systolic points - maxima)
     systolic_peaks, _ = signal.find_peaks(signal_array, height=None, distance=50)
 
 
-    # Find diastolic points (minima) by inverting signal
-    diastolic_peaks, _ = signal.find_peaks(-signal_array, height=None, distance=50)
+    # Find diastolic points (minima) by inverting signal; signal_array is our
+    # own copy, so negate it in place rather than allocating a second array
+    np.negative(signal_array, out=signal_array)
+    diastolic_peaks, _ = signal.find_peaks(signal_array, height=None, distance=50)
 
     return {
-        'systolic': systolic_peaks.tolist(),
-        'diastolic': diastolic_peaks.tolist()
+        'systolic': systolic_peaks,
+        'diastolic': diastolic_peaks
     }
 
+def read_segment(handle, start_idx, end_idx):
+    """Read samples [start_idx, end_idx) of a cached file with derivatives.
+
+    Derivatives are computed lazily for just this segment: enough neighboring
+    samples are read to compute them exactly as over the whole signal.
+
+    Returns:
+        (columns, data) with data an (n, len(columns)) array
+    """
+    entry = _FILE_CACHE[handle]
+    sampling_rate = entry['metadata'].get('sampling_rate', 250)
+    n_samples = entry['n_samples']
+
+    pad = abp_derivative_window_length(sampling_rate) // 2
+    read_start = max(0, start_idx - pad)
+    read_end = min(n_samples, end_idx + pad)
+    window = read_cached_signals(entry, read_start, read_end)
+    window = compute_abp_derivatives(window, sampling_rate)
+
+    offset = start_idx - read_start
+    data = np.column_stack([values[offset:offset + end_idx - start_idx] for values in window.values()])
+    return list(window), data
+
 def get_segment(params):
     """Extract a specific segment from file data.
 
     Args:
-        params: dict with 'file_data', 'segment_index', and 'segment_length'
+        params: dict with 'segment_index' and either 'handle' (returned by
+            load_patient_file) or 'file_data', plus optional 'segment_length'
+            (defaults to the file's chunk_size, or 2000 for 'file_data')
     """
-    file_data = params['file_data']
     segment_index = params['segment_index']
+
+    if 'handle' in params:
+        if params['handle'] not in _FILE_CACHE:
+            raise ValueError("File is no longer loaded, reload it to get segments")
+        entry = _FILE_CACHE[params['handle']]
+        segment_length = params.get('segment_length', entry['metadata']['chunk_size'])
+
+        n_samples = entry['n_samples']
+        start_idx = min(segment_index * segment_length, n_samples)
+        end_idx = min(start_idx + segment_length, n_samples)
+        if start_idx == end_idx:
+            return {'columns': entry['columns'], 'data': []}
+
+        columns, data = read_segment(params['handle'], start_idx, end_idx)
+        return {'columns': columns, 'data': data}
+
+    file_data = params['file_data']
     segment_length = params.get('segment_length', 2000)  # Default to 2000 for backward compatibility
 
-    # Convert file_data back to DataFrame
-    df = pd.DataFrame(file_data['data'], columns=file_data['columns'])
+    # Convert file_data back to a (samples, columns) array
+    data = decode_signal_columns(file_data)
 
     # Extract segment
     start_idx = segment_index * segment_length
-    end_idx = min(start_idx + segment_length, len(df))
-    segment_df = df.iloc[start_idx:end_idx]
+    end_idx = min(start_idx + segment_length, len(data))
 
     return {
-        'columns': segment_df.columns.tolist(),
-        'data': segment_df.values.tolist()
+        'columns': file_data['columns'],
+        'data': data[start_idx:end_idx]
     }
 
 def calculate_derivative(params):
@@ -426,14 +827,14 @@ def calculate_derivative(params):
     signal_data = params['signal_data']
 
     # Convert to numpy array
-    signal_array = np.array(signal_data)
+    signal_array = np.array(signal_data, dtype=np.float32)
 
     # Apply Savitzky-Golay filter for derivative
     window_length = 11
     polyorder = 3
-    derivative = signal.savgol_filter(signal_array, window_length, polyorder, deriv=1)
+    derivative = savgol_derivative(signal_array, window_length, polyorder, deriv=1)
 
-    return derivative.tolist()
+    return derivative
 
 
 def find_onset_compression(params):
@@ -447,7 +848,7 @@ def find_onset_compression(params):
         params: dict with 'signal_data', 'systolic_peaks', optional 'window', and optional 'offset'
 
     Returns:
-        list of onset indices (with offset subtracted)
+        array of onset indices (with offset subtracted)
     """
     signal_data = params['signal_data']
     systolic_peaks = params['systolic_peaks']
@@ -455,7 +856,7 @@ def find_onset_compression(params):
     offset = params.get('offset', 10)
 
     # Convert to numpy array
-    signal_array = np.array(signal_data)
+    signal_array = np.array(signal_data, dtype=np.float32)
 
     # Compute second derivative using same parameters as ABP derivative computation
     window_length = 15
@@ -464,23 +865,22 @@ def find_onset_compression(params):
     polyorder = 3
 
     try:
-        der2 = signal.savgol_filter(signal_array, window_length, polyorder, deriv=2)
+        der2 = savgol_derivative(signal_array, window_length, polyorder, deriv=2)
 
         # Find peaks in second derivative (same params as abp_features.py)
         der2_peaks, _ = signal.find_peaks(der2, distance=20, prominence=0.05)
 
-        # Find onset for each systolic peak
-        onsets = []
-        for p in systolic_peaks:
-            # Find der2 peaks within window before systolic peak
-            o = der2_peaks[(der2_peaks < p) & (p - der2_peaks < window)]
-            if len(o) != 0:
-                # Take the last one (closest to systolic peak) and subtract offset
-                onset_idx = int(o[-1]) - offset
-                # Ensure index doesn't go negative
-                onsets.append(max(0, onset_idx))
-
-        log_error(f"Found {len(onsets)} onset points from {len(systolic_peaks)} systolic peaks (offset={offset})")
+        # Find onset for each systolic peak: the last der2 peak before it
+        # (closest to the systolic peak), kept only if within the window
+        peaks = np.asarray(systolic_peaks, dtype=np.int64)
+        last_before = np.searchsorted(der2_peaks, peaks, side='left') - 1
+        has_before = last_before >= 0  # all False when there are no der2 peaks
+        candidates = der2_peaks[np.clip(last_before, 0, None)] if len(der2_peaks) else peaks
+        in_window = has_before & (peaks - candidates < window)
+        # Subtract offset, ensuring index doesn't go negative
+        onsets = np.maximum(candidates[in_window] - offset, 0)
+
+        log_debug(f"Found {len(onsets)} onset points from {len(systolic_peaks)} systolic peaks (offset={offset})")
         return onsets
 
     except Exception as e:
@@ -504,7 +904,7 @@ def find_upslope(params):
             - max_distance: maximum distance from systolic peak to keep
 
     Returns:
-        list of upslope indices
+        array of upslope indices
     """
     signal_data = params['signal_data']
     systolic_peaks = params.get('systolic_peaks', [])
@@ -514,7 +914,7 @@ def find_upslope(params):
     max_distance = params.get('max_distance', 50)
 
     # Convert to numpy array
-    signal_array = np.array(signal_data)
+    signal_array = np.array(signal_data, dtype=np.float32)
 
     # Compute first derivative using savgol_filter
     window_length = 15
@@ -523,7 +923,7 @@ def find_upslope(params):
     polyorder = 3
 
     try:
-        der1 = signal.savgol_filter(signal_array, window_length, polyorder, deriv=1)
+        der1 = savgol_derivative(signal_array, window_length, polyorder, deriv=1)
 
         # Compute threshold based on method
         if threshold_method == 'percentile':
@@ -533,29 +933,31 @@ def find_upslope(params):
         else:  # fixed
             threshold = threshold_value
 
-        log_error(f"Upslope threshold ({threshold_method}): {threshold}")
+        log_debug(f"Upslope threshold ({threshold_method}): {threshold}")
 
         # Find where derivative crosses above threshold
         above_threshold = der1 > threshold
         # Find rising edges (0 -> 1 transitions)
         crossings = np.where(np.diff(above_threshold.astype(int)) == 1)[0]
 
-        log_error(f"Found {len(crossings)} threshold crossings")
+        log_debug(f"Found {len(crossings)} threshold crossings")
 
         # Filter by distance from systolic peaks
         if len(systolic_peaks) > 0 and (min_distance > 0 or max_distance > 0):
-            filtered = []
-            for c in crossings:
-                for p in systolic_peaks:
-                    dist = abs(int(c) - int(p))
-                    if dist >= min_distance and (max_distance == 0 or dist <= max_distance):
-                        filtered.append(int(c))
-                        break
-            log_error(f"After filtering by distance ({min_distance}-{max_distance}): {len(filtered)} points")
+            # Keep a crossing if any peak lies in [c - max, c - min] or [c + min, c + max];
+            # with sorted peaks, each interval is a pair of binary searches
+            peaks = np.sort(np.asarray(systolic_peaks, dtype=np.int64))
+            upper = max_distance if max_distance > 0 else len(signal_array)
+            before = (np.searchsorted(peaks, crossings - min_distance, side='right')
+                      - np.searchsorted(peaks, crossings - upper, side='left'))
+            after = (np.searchsorted(peaks, crossings + upper, side='right')
+                     - np.searchsorted(peaks, crossings + min_distance, side='left'))
+            filtered = crossings[(before > 0) | (after > 0)]
+            log_debug(f"After filtering by distance ({min_distance}-{max_distance}): {len(filtered)} points")
             return filtered
         else:
             # No filtering, return all crossings
-            return [int(c) for c in crossings]
+            return crossings
 
     except Exception as e:
         log_error(f"Error in find_upslope: {e}")
@@ -579,6 +981,26 @@ METHODS = {
     'find_upslope': find_upslope
 }
 
+def to_serializable(obj):
+    """Convert numpy values orjson cannot serialize natively.
+
+    Passed as the `default` hook of orjson.dumps for anything
+    OPT_SERIALIZE_NUMPY does not cover (e.g. non-contiguous arrays).
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(response):
+    """Serialize a response to JSON bytes, encoding numpy arrays in C."""
+    return orjson.dumps(
+        response,
+        default=to_serializable,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+
 def process_message(message):
     """Process a single message from Electron."""
     try:
@@ -606,52 +1028,64 @@ def process_message(message):
             'error': str(e)
         }
 
+def read_frame(stream):
+    """Read one length-prefixed frame from a binary stream.
+
+    Frames are a 4-byte little-endian payload length followed by the payload.
+
+    Returns:
+        payload bytes, or None at EOF
+    """
+    header = stream.read(FRAME_HEADER_BYTES)
+    if len(header) < FRAME_HEADER_BYTES:
+        return None
+    length = int.from_bytes(header, 'little')
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return payload
+
+def write_frame(stream, payload):
+    """Write one length-prefixed frame to a binary stream and flush it."""
+    stream.write(len(payload).to_bytes(FRAME_HEADER_BYTES, 'little') + payload)
+    stream.flush()
+
 def main():
-    """Main loop: read JSON from stdin, process, write JSON to stdout."""
+    """Main loop: read JSON frames from stdin, process, write JSON frames to stdout."""
     log_error("Python backend started")
 
-    # Set stdout and stdin to unbuffered mode
-    sys.stdout.reconfigure(line_buffering=True)
-    sys.stdin.reconfigure(line_buffering=True)
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    # Stray prints would corrupt the framed stream, so send them to stderr
+    sys.stdout = sys.stderr
 
     while True:
         try:
-            # Read line from stdin
-            line = sys.stdin.readline()
+            # Read frame from stdin
+            payload = read_frame(stdin)
 
             # Check for EOF
-            if not line:
+            if payload is None:
                 log_error("EOF reached on stdin")
                 break
 
-            line = line.strip()
-
-            # Skip empty lines
-            if not line:
-                log_error("Empty line received, continuing")
-                continue
-
-            log_error(f"Raw line received: {line[:100]}...")  # Log first 100 chars
+            log_debug(f"Raw frame received: {payload[:100]}...")  # Log first 100 bytes
 
             # Parse JSON message
             try:
-                message = json.loads(line)
-            except json.JSONDecodeError as e:
-                log_error(f"JSON decode error: {e}, line was: {line}")
+                message = orjson.loads(payload)
+            except orjson.JSONDecodeError as e:
+                log_error(f"JSON decode error: {e}, frame was: {payload[:1000]}")
                 continue
 
-            log_error(f"Received message: {message.get('method')}")
+            log_debug(f"Received message: {message.get('method')}")
 
             # Process message
             response = process_message(message)
 
             # Send response to stdout
-            response_json = json.dumps(response)
-            print(response_json, flush=True)
-            log_error(f"Sent response for: {message.get('method')}")
-
-            # Force flush
-            sys.stdout.flush()
+            write_frame(stdout, dumps(response))
+            log_debug(f"Sent response for: {message.get('method')}")
 
         except KeyboardInterrupt:
             log_error("Keyboard interrupt received")
@@ -35,7 +35,7 @@ if exist build rmdir /s /q build
 REM Step 1: Bundle Python backend
 echo.
 echo Step 1/3: Bundling Python backend...
-pyinstaller --onefile --distpath python_dist --name labeler_backend --hidden-import scipy --hidden-import pandas --hidden-import h5py --hidden-import numpy backend/labeler_backend.py
+pyinstaller --onefile --distpath python_dist --name labeler_backend --hidden-import scipy --hidden-import pandas --hidden-import h5py --hidden-import numpy --hidden-import orjson backend/labeler_backend.py
 
 if not exist python_dist\labeler_backend.exe (
     echo Failed to create Python bundle
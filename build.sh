@@ -47,6 +47,7 @@ pyinstaller \
     --hidden-import pandas \
     --hidden-import h5py \
     --hidden-import numpy \
+    --hidden-import orjson \
     backend/labeler_backend.py
 
 if [ ! -f "python_dist/labeler_backend.exe" ] && [ ! -f "python_dist/labeler_backend" ]; then
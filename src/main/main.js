@@ -414,8 +414,10 @@ ipcMain.handle('find-upslope', async (event, signalData, systolicPeaks, threshol
 // Get segment data
 ipcMain.handle('get-segment', async (event, fileData, segmentIndex) => {
   try {
+    // Segments are sliced from the backend's copy of the file, so only the
+    // handle returned by load_patient_file needs to cross the pipe
     const segmentData = await pythonBridge.call('get_segment', {
-      file_data: fileData,
+      handle: fileData.handle,
       segment_index: segmentIndex
     });
     return { success: true, data: segmentData };
@@ -1,15 +1,23 @@
-const { PythonShell } = require('python-shell');
 const path = require('path');
 const { app } = require('electron');
 const { spawn } = require('child_process');
 const { isAllowedPythonMethod } = require('./security');
 
+// Messages in both directions are framed as a 4-byte little-endian payload
+// length followed by the UTF-8 JSON payload
+const FRAME_HEADER_BYTES = 4;
+
 class PythonBridge {
   constructor() {
     this.pythonProcess = null;
     this.messageId = 0;
     this.pendingCalls = new Map();
     this.isDev = !app.isPackaged;
+
+    // Buffered stdout chunks not yet consumed as complete frames
+    this.chunks = [];
+    this.bufferedLength = 0;
+    this.expectedLength = null;
   }
 
   start() {
@@ -22,20 +30,15 @@ class PythonBridge {
   }
 
   startDevelopment() {
-    // Development: use local Python installation with PythonShell
+    // Development: use local Python installation
     const pythonPath = 'python';
     const scriptPath = path.join(process.cwd(), 'backend', 'labeler_backend.py');
 
-    const options = {
-      mode: 'json',
-      pythonPath: pythonPath,
-      scriptPath: path.dirname(scriptPath),
-      args: []
-    };
+    console.log('Starting Python bridge (dev) with script:', scriptPath);
 
-    console.log('Starting Python bridge (dev) with options:', options);
-
-    this.pythonProcess = new PythonShell(path.basename(scriptPath), options);
+    this.pythonProcess = spawn(pythonPath, [scriptPath], {
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
 
     this.setupHandlers();
   }
@@ -51,28 +54,19 @@ class PythonBridge {
       stdio: ['pipe', 'pipe', 'pipe']
     });
 
-    // Buffer for incomplete JSON messages
-    let buffer = '';
+    this.setupHandlers();
+  }
 
-    // Handle stdout messages
+  setupHandlers() {
+    this.chunks = [];
+    this.bufferedLength = 0;
+    this.expectedLength = null;
+
+    // Handle stdout frames
     this.pythonProcess.stdout.on('data', (data) => {
-      buffer += data.toString();
-
-      // Process complete JSON lines
-      const lines = buffer.split('\n');
-      buffer = lines.pop(); // Keep incomplete line in buffer
-
-      for (const line of lines) {
-        if (line.trim()) {
-          try {
-            const message = JSON.parse(line);
-            console.log('Received from Python:', message);
-            this.handleMessage(message);
-          } catch (e) {
-            console.error('Failed to parse JSON:', line, e);
-          }
-        }
-      }
+      this.chunks.push(data);
+      this.bufferedLength += data.length;
+      this.processFrames();
     });
 
     // Handle stderr
@@ -92,28 +86,36 @@ class PythonBridge {
     });
   }
 
-  setupHandlers() {
-    // Handle messages from Python (for PythonShell in dev mode)
-    this.pythonProcess.on('message', (message) => {
-      console.log('Received from Python:', message);
-      this.handleMessage(message);
-    });
+  // Remove and return the first n buffered bytes (caller checks availability).
+  // Chunks are only concatenated here, once per header or payload, so large
+  // responses arriving in many small chunks are not copied repeatedly.
+  takeBytes(n) {
+    const all = this.chunks.length === 1 ? this.chunks[0] : Buffer.concat(this.chunks, this.bufferedLength);
+    const rest = all.subarray(n);
+    this.chunks = rest.length > 0 ? [rest] : [];
+    this.bufferedLength = rest.length;
+    return all.subarray(0, n);
+  }
 
-    // Handle stderr output from Python
-    this.pythonProcess.on('stderr', (stderr) => {
-      console.log('Python stderr:', stderr);
-    });
+  processFrames() {
+    while (true) {
+      if (this.expectedLength === null) {
+        if (this.bufferedLength < FRAME_HEADER_BYTES) return;
+        this.expectedLength = this.takeBytes(FRAME_HEADER_BYTES).readUInt32LE(0);
+      }
 
-    // Handle errors
-    this.pythonProcess.on('error', (error) => {
-      console.error('Python process error:', error);
-    });
+      if (this.bufferedLength < this.expectedLength) return;
+      const payload = this.takeBytes(this.expectedLength);
+      this.expectedLength = null;
 
-    // Handle process exit
-    this.pythonProcess.on('close', () => {
-      console.log('Python process closed');
-      this.pythonProcess = null;
-    });
+      try {
+        const message = JSON.parse(payload.toString('utf8'));
+        console.log('Received from Python:', message);
+        this.handleMessage(message);
+      } catch (e) {
+        console.error('Failed to parse JSON frame:', e);
+      }
+    }
   }
 
   handleMessage(message) {
@@ -131,17 +133,7 @@ class PythonBridge {
 
   stop() {
     if (this.pythonProcess) {
-      if (this.isDev) {
-        // PythonShell has .end() method
-        this.pythonProcess.end((err) => {
-          if (err) {
-            console.error('Error stopping Python process:', err);
-          }
-        });
-      } else {
-        // Child process has .kill() method
-        this.pythonProcess.kill();
-      }
+      this.pythonProcess.kill();
     }
   }
 
@@ -167,13 +159,10 @@ class PythonBridge {
 
       console.log('Sending to Python:', message);
 
-      if (this.isDev) {
-        // PythonShell uses .send()
-        this.pythonProcess.send(message);
-      } else {
-        // Child process uses stdin.write()
-        this.pythonProcess.stdin.write(JSON.stringify(message) + '\n');
-      }
+      const payload = Buffer.from(JSON.stringify(message), 'utf8');
+      const header = Buffer.alloc(FRAME_HEADER_BYTES);
+      header.writeUInt32LE(payload.length, 0);
+      this.pythonProcess.stdin.write(Buffer.concat([header, payload]));
 
       // Timeout after 30 seconds
       setTimeout(() => {
@@ -497,6 +497,7 @@ async function loadFile() {
   }
 
   state.fileData = fileResult.data;
+  state.fileData.signals = decodeSignalColumns(fileResult.data);
   state.metadata = fileResult.data.metadata;
   state.annotations = fileResult.data.annotations;
   state.cprLabels = fileResult.data.cpr_labels;  // CPR labels per segment (0=non-CPR, 1=CPR)
@@ -568,8 +569,28 @@ async function loadFile() {
   document.body.focus();
 }
 
+// Decode base64 little-endian float32 columns from the backend into typed arrays
+function decodeSignalColumns(fileData) {
+  const signals = {};
+  fileData.columns.forEach(col => {
+    const binary = atob(fileData.data[col]);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+      bytes[i] = binary.charCodeAt(i);
+    }
+    signals[col] = new Float32Array(bytes.buffer);
+  });
+  return signals;
+}
+
+// Get samples [startIdx, endIdx) of a signal as a plain array (safe to send over IPC)
+function getSignalSlice(signalName, startIdx, endIdx) {
+  const values = state.fileData.signals[signalName];
+  return values ? Array.from(values.subarray(startIdx, endIdx)) : [];
+}
+
 function createSegments() {
-  const totalSamples = state.fileData.data.length;
+  const totalSamples = state.fileData.n_samples;
   const segmentLength = state.metadata ? state.metadata.chunk_size : 2000;
   const numSegments = Math.floor(totalSamples / segmentLength);
   state.segments = Array.from({ length: numSegments }, (_, i) => i);
@@ -935,8 +956,7 @@ function updateGraph() {
   const samplingRate = state.metadata ? state.metadata.sampling_rate : 250;
 
   const startIdx = state.currentSegment * segmentLength;
-  const endIdx = Math.min(startIdx + segmentLength, state.fileData.data.length);
-  const segmentData = state.fileData.data.slice(startIdx, endIdx);
+  const endIdx = Math.min(startIdx + segmentLength, state.fileData.n_samples);
 
   const visibleSignalsList = state.signalNames.filter(s => state.visibleSignals.has(s));
 
@@ -955,10 +975,8 @@ function updateGraph() {
   let subplotIndex = 1;
 
   sortedVisibleSignals.forEach((signalName, idx) => {
-    // Use columnOrder for data indexing (original column order from file)
-    const signalIndex = state.columnOrder.indexOf(signalName);
-    const xValues = segmentData.map((_, i) => i / samplingRate);
-    const yValues = segmentData.map(row => row[signalIndex]);
+    const yValues = getSignalSlice(signalName, startIdx, endIdx);
+    const xValues = yValues.map((_, i) => i / samplingRate);
 
     // Get color based on signal name
     const signalColor = getSignalColor(signalName);
@@ -991,8 +1009,7 @@ function updateGraph() {
 
     // Draw markers for active signal (full size)
     const activeLabelIndexes = getActiveLabelIndexes(segmentId);
-    const activeSignalDataIdx = state.columnOrder.indexOf(state.activeSignal);
-    const activeYValues = activeSignalDataIdx >= 0 ? segmentData.map(row => row[activeSignalDataIdx]) : [];
+    const activeYValues = getSignalSlice(state.activeSignal, startIdx, endIdx);
 
     Object.entries(LABEL_COLORS).forEach(([labelType, color]) => {
       const indices = activeLabelIndexes[labelType] || [];
@@ -1029,9 +1046,8 @@ function updateGraph() {
       const sigSubplotIdx = sortedVisibleSignals.indexOf(signalName);
       if (sigSubplotIdx < 0) return; // not visible
 
-      const sigDataIdx = state.columnOrder.indexOf(signalName);
-      if (sigDataIdx < 0) return;
-      const sigYValues = segmentData.map(row => row[sigDataIdx]);
+      if (state.columnOrder.indexOf(signalName) < 0) return;
+      const sigYValues = getSignalSlice(signalName, startIdx, endIdx);
       const sigYaxis = `y${sigSubplotIdx + 1}`;
 
       Object.entries(LABEL_COLORS).forEach(([labelType, color]) => {
@@ -1386,13 +1402,11 @@ function updateGraphMarkersOnly() {
   const samplingRate = state.metadata ? state.metadata.sampling_rate : 250;
   const segmentLength = state.metadata ? state.metadata.chunk_size : 2000;
   const startIdx = state.currentSegment * segmentLength;
-  const endIdx = Math.min(startIdx + segmentLength, state.fileData.data.length);
-  const segmentData = state.fileData.data.slice(startIdx, endIdx);
+  const endIdx = Math.min(startIdx + segmentLength, state.fileData.n_samples);
 
   // Get the active signal for y-values
-  const activeSignalIndex = state.columnOrder.indexOf(state.activeSignal);
-  if (activeSignalIndex < 0) return;
-  const yValues = segmentData.map(row => row[activeSignalIndex]);
+  if (state.columnOrder.indexOf(state.activeSignal) < 0) return;
+  const yValues = getSignalSlice(state.activeSignal, startIdx, endIdx);
 
   // Find and update the marker traces
   const labelTypes = Object.keys(LABEL_COLORS);
@@ -1702,12 +1716,10 @@ async function findPeaks(targetLabelType) {
   // Get current segment data
   const segmentLength = state.metadata ? state.metadata.chunk_size : 2000;
   const startIdx = state.currentSegment * segmentLength;
-  const endIdx = Math.min(startIdx + segmentLength, state.fileData.data.length);
-  const segmentData = state.fileData.data.slice(startIdx, endIdx);
+  const endIdx = Math.min(startIdx + segmentLength, state.fileData.n_samples);
 
   // Extract active signal values
-  const signalIndex = state.columnOrder.indexOf(state.activeSignal);
-  const signalValues = segmentData.map(row => row[signalIndex]);
+  const signalValues = getSignalSlice(state.activeSignal, startIdx, endIdx);
 
   console.log('Using signal:', state.activeSignal, 'with', signalValues.length, 'samples');
 
@@ -1804,12 +1816,10 @@ async function findOnsetCompression() {
   // Get current segment data
   const segmentLength = state.metadata ? state.metadata.chunk_size : 2000;
   const startIdx = state.currentSegment * segmentLength;
-  const endIdx = Math.min(startIdx + segmentLength, state.fileData.data.length);
-  const segmentData = state.fileData.data.slice(startIdx, endIdx);
+  const endIdx = Math.min(startIdx + segmentLength, state.fileData.n_samples);
 
   // Extract active signal values
-  const signalIndex = state.columnOrder.indexOf(state.activeSignal);
-  const signalValues = segmentData.map(row => row[signalIndex]);
+  const signalValues = getSignalSlice(state.activeSignal, startIdx, endIdx);
 
   console.log('Finding onset compression with window:', windowSize, 'offset:', offset, 'using', systolicPeaks.length, 'systolic peaks');
 
@@ -1902,12 +1912,10 @@ async function findUpslope() {
   // Get current segment data
   const segmentLength = state.metadata ? state.metadata.chunk_size : 2000;
   const startIdx = state.currentSegment * segmentLength;
-  const endIdx = Math.min(startIdx + segmentLength, state.fileData.data.length);
-  const segmentData = state.fileData.data.slice(startIdx, endIdx);
+  const endIdx = Math.min(startIdx + segmentLength, state.fileData.n_samples);
 
   // Extract active signal values
-  const signalIndex = state.columnOrder.indexOf(state.activeSignal);
-  const signalValues = segmentData.map(row => row[signalIndex]);
+  const signalValues = getSignalSlice(state.activeSignal, startIdx, endIdx);
 
   console.log('Finding upslope with method:', thresholdMethod, 'value:', thresholdValue, 'minDistance:', minDistance, 'maxDistance:', maxDistance);
 